@@ -1,25 +1,201 @@
-from flask import Flask, render_template_string, request
-from datetime import datetime, date
+from flask import Flask, Response, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+from markupsafe import Markup
+from flask_caching import Cache, CachedResponse
+from flask_compress import Compress
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, date, timedelta
+from zoneinfo import ZoneInfo
+import hashlib
+import logging
+import math
 import os
+import re
+import tempfile
+import threading
 import time
+import numpy as np
+import orjson
 import requests
+from cachetools import LRUCache, TLRUCache, TTLCache, cached
+from cachetools.keys import hashkey
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from numba import njit
+except ImportError:
+    # numba wheels can lag new Python/NumPy releases; the kernels still run as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask's JSON provider with orjson doing the encoding and decoding"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Skip the bytes -> str -> bytes round trip dumps() would add
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=orjson.OPT_SERIALIZE_NUMPY)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+# Static files are only referenced through content-versioned URLs, so they can be cached for a year
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000
+Compress(app)
+
+# DEBUG for per-request diagnostics; production stays at INFO and skips formatting them
+log = app.logger
+log.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
 
 # Get API key from environment variable
 POLYGON_API_KEY = os.environ.get('POLYGON_API_KEY', '')
 
+# Contracts expiring further out than this are never shown
+MAX_DAYS_TO_EXPIRATION = 90
+
+# Shared session so Polygon keep-alive connections are reused across requests
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=3,
+        connect=0,  # connect and read timeouts already spent the attempt's budget; don't wait again
+        read=0,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=False,  # short backoff only; Retry-After can exceed the request budget
+        raise_on_status=False  # hand the last response back so status errors are reported as before
+    )
+))
+
+# Spot prices are shared by everyone requesting the same ticker for this long
+PRICE_CACHE_DURATION = 60  # seconds
+
+# Worker threads for overlapping independent Polygon calls (price + calls + puts per fetch)
+EXECUTOR = ThreadPoolExecutor(max_workers=8)
+CHAIN_FETCH_TIMEOUT = 25  # seconds per fresh fetch (price + chains), inside gunicorn's 30s timeout
+
+# Per-ticker cache of processed chains; slider/filter changes are served from here
+CACHE_DURATION = 300  # seconds, while the market is open
+CACHE_DURATION_CLOSED = 3600  # seconds, outside regular trading hours
+MARKET_TZ = ZoneInfo('America/New_York')
+
+
+def cache_ttl():
+    """Seconds a freshly fetched chain stays valid, based on US market hours"""
+    now = datetime.now(MARKET_TZ)
+    if now.weekday() < 5:
+        market_open = now.replace(hour=9, minute=30, second=0, microsecond=0)
+        market_close = now.replace(hour=16, minute=0, second=0, microsecond=0)
+        if now < market_open:
+            return min(CACHE_DURATION_CLOSED, (market_open - now).total_seconds())
+        if now < market_close:
+            return min(CACHE_DURATION, (market_close - now).total_seconds())
+    return CACHE_DURATION_CLOSED
+
+
+def market_is_open():
+    """True during regular US trading hours (weekdays, 9:30-16:00 ET)"""
+    now = datetime.now(MARKET_TZ)
+    return now.weekday() < 5 and (9, 30) <= (now.hour, now.minute) < (16, 0)
+
+
+# Entries expire cache_ttl() after the chain was fetched, not after they were inserted here,
+# so chains picked up from the shared cache don't get their lifetime extended
+CACHE = TLRUCache(maxsize=512, ttu=lambda _key, value, now: now + cache_ttl() - (time.time() - value['fetched_at']))
+CACHE_LOCK = threading.RLock()
+
+# Rendered pages (keyed by URL query string) and fetched chains (keyed by ticker), shared by
+# every gunicorn worker. FileSystemCache by default; set CACHE_TYPE=RedisCache and
+# CACHE_REDIS_URL to share them across instances as well.
+PAGE_CACHE_DURATION = 5  # seconds, while the market is open
+
+
+def _build_id():
+    """Short hash of the code and stylesheet this process serves"""
+    digest = hashlib.blake2b(digest_size=8)
+    for path in (__file__, os.path.join(app.static_folder, 'app.css')):
+        with open(path, 'rb') as source:
+            digest.update(source.read())
+    return digest.hexdigest()
+
+
+BUILD_ID = _build_id()
+shared_cache = Cache(app, config={
+    'CACHE_TYPE': os.environ.get('CACHE_TYPE', 'FileSystemCache'),
+    'CACHE_DIR': os.environ.get('CACHE_DIR', os.path.join(tempfile.gettempdir(), 'options-analyzer-cache')),
+    'CACHE_REDIS_URL': os.environ.get('CACHE_REDIS_URL'),
+    'CACHE_DEFAULT_TIMEOUT': 60
+})
+
+
+def page_cache_key(*args, **kwargs):
+    """
+    Shared-cache key for a rendered response: build, path and order-independent query string.
+    The shared tier outlives deploys, so a new release must never read pages the previous
+    template rendered.
+    """
+    query = hashlib.blake2b(str(sorted(request.args.items(multi=True))).encode(), digest_size=16).hexdigest()
+    return f"page:{BUILD_ID}:{request.path}:{query}"
+
+
+def page_cache_timeout():
+    """Seconds to keep a rendered page: briefly while trading, until the next open otherwise"""
+    if market_is_open():
+        return PAGE_CACHE_DURATION
+    return max(1, int(cache_ttl()))
+
+
+def fetch_stock_price(ticker, deadline=None):
+    """
+    Fetch current stock price from Polygon.io, reused for PRICE_CACHE_DURATION seconds.
+    The request's timeout is capped at the time left before time.monotonic() passes deadline.
+    """
+    timeout = 10
+    if deadline is not None:
+        timeout = min(timeout, deadline - time.monotonic())
+        if timeout <= 0:
+            return None, "fetch deadline passed"
+    try:
+        return _cached_price(ticker, timeout), None
+    except LookupError as e:
+        return None, str(e)
+
+
+# Keyed on ticker alone: the timeout only bounds how long a miss may take
+@cached(
+    cache=TTLCache(maxsize=256, ttl=PRICE_CACHE_DURATION),
+    key=lambda ticker, timeout: hashkey(ticker),
+    lock=threading.Lock()
+)
+def _cached_price(ticker, timeout):
+    # errors raise so they are never cached
+    price, error = _fetch_stock_price_uncached(ticker, timeout)
+    if error:
+        raise LookupError(error)
+    return price
+
 
-def fetch_stock_price(ticker):
+def _fetch_stock_price_uncached(ticker, timeout=10):
     """Fetch current stock price from Polygon.io"""
     url = f"https://api.polygon.io/v2/aggs/ticker/{ticker}/prev?adjusted=true&apiKey={POLYGON_API_KEY}"
 
     try:
-        response = requests.get(url, timeout=10)
+        response = SESSION.get(url, timeout=timeout)
         if response.status_code != 200:
             return None, f"Error fetching price: {response.status_code}"
 
-        data = response.json()
+        data = orjson.loads(response.content)
         if data.get('results') and len(data['results']) > 0:
             price = float(data['results'][0]['c'])  # closing price
             return price, None
@@ -28,7 +204,7 @@ def fetch_stock_price(ticker):
         return None, f"Error: {str(e)}"
 
 
-def fetch_options_chain_page(ticker, limit=250, next_url=None):
+def fetch_options_chain_page(ticker, limit=250, next_url=None, contract_type=None, timeout=15):
     """
     Fetch ONE page of options snapshot data from Polygon.io (supports pagination via next_url).
     Returns: (results_list, next_url, error_string_or_None)
@@ -36,40 +212,49 @@ def fetch_options_chain_page(ticker, limit=250, next_url=None):
     if next_url:
         url = f"{next_url}&apiKey={POLYGON_API_KEY}"
     else:
-        url = f"https://api.polygon.io/v3/snapshot/options/{ticker}?limit={limit}&apiKey={POLYGON_API_KEY}"
+        # Only ask for expirations we can actually use; next_url carries these filters forward
+        today = date.today()
+        horizon = today + timedelta(days=MAX_DAYS_TO_EXPIRATION)
+        url = (
+            f"https://api.polygon.io/v3/snapshot/options/{ticker}"
+            f"?expiration_date.gt={today.isoformat()}&expiration_date.lte={horizon.isoformat()}"
+        )
+        if contract_type:
+            url += f"&contract_type={contract_type}"
+        url += f"&limit={limit}&apiKey={POLYGON_API_KEY}"
 
     try:
         # Don't log full URL with API key
-        print(f"Fetching options from: {url.split('apiKey=')[0]}...")
-        response = requests.get(url, timeout=15)
-        print(f"Response status: {response.status_code}")
+        log.debug("Fetching options from: %s...", url.split('apiKey=')[0])
+        response = SESSION.get(url, timeout=timeout)
+        log.debug("Response status: %s", response.status_code)
 
         if response.status_code != 200:
-            print(f"Error response: {response.text[:200]}")
+            log.warning("Error response: %s", response.text[:200])
             return None, None, f"Error fetching options: {response.status_code} - {response.text[:100]}"
 
-        data = response.json()
+        data = orjson.loads(response.content)
         results = data.get('results', [])
         next_url_out = data.get('next_url')  # Polygon pagination
 
         if results:
             # Light debug: show one sample contract without being too noisy
-            print(f"Number of results: {len(results)}")
-            print(f"Sample result keys: {list(results[0].keys())}")
+            log.debug("Number of results: %d", len(results))
+            log.debug("Sample result keys: %s", list(results[0].keys()))
         else:
-            print("Number of results: 0")
+            log.debug("Number of results: 0")
 
         return results, next_url_out, None
     except Exception as e:
-        print(f"Exception fetching options: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Exception fetching options: %s", e)
         return None, None, f"Error: {str(e)}"
 
 
-def fetch_options_chain(ticker, max_pages=20, page_limit=250, target_contracts=2000):
+def fetch_options_chain(ticker, max_pages=20, page_limit=250, target_contracts=2000, contract_type=None,
+                        deadline=None):
     """
-    Fetch options chain from Polygon.io with pagination.
+    Fetch options chain from Polygon.io with pagination, optionally only 'call' or 'put' contracts.
+    Stops with an error once time.monotonic() passes deadline, so an abandoned fetch frees its thread.
     Returns: (all_results_list, error_string_or_None)
     """
     all_results = []
@@ -77,8 +262,17 @@ def fetch_options_chain(ticker, max_pages=20, page_limit=250, target_contracts=2
     pages = 0
 
     while pages < max_pages:
+        page_timeout = 15
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None, f"gave up after {pages} page(s): fetch deadline passed"
+            page_timeout = min(page_timeout, remaining)
+
         pages += 1
-        page_results, next_url, error = fetch_options_chain_page(ticker, limit=page_limit, next_url=next_url)
+        page_results, next_url, error = fetch_options_chain_page(
+            ticker, limit=page_limit, next_url=next_url, contract_type=contract_type, timeout=page_timeout
+        )
         if error:
             return None, error
 
@@ -94,214 +288,430 @@ def fetch_options_chain(ticker, max_pages=20, page_limit=250, target_contracts=2
         if not next_url:
             break
 
-        time.sleep(0.25)  # gentle rate limiting between pages
-
-    print(f"Received {len(all_results)} options contracts across {pages} page(s)")
+    log.debug("Received %d options contracts across %d page(s)", len(all_results), pages)
     return all_results, None
 
 
-def fetch_options_data(ticker, max_delta_calls=0.18, max_delta_puts=0.18, filter_type='both'):
-    """Fetch and process options data from Polygon.io"""
-    try:
-        ticker = ticker.upper()
+def format_expiration(expiration_str):
+    """Format a YYYY-MM-DD expiration for display"""
+    exp_date = date(int(expiration_str[:4]), int(expiration_str[5:7]), int(expiration_str[8:10]))
+    return exp_date.strftime('%b %d, %Y')
+
+
+# One record per candidate contract in a cached chain; exp_idx points into the chain's expiration labels
+CANDIDATE_DTYPE = np.dtype([
+    ('is_call', np.bool_),
+    ('strike', np.float64),
+    ('days', np.int32),
+    ('premium', np.float64),
+    ('bid', np.float64),
+    ('ask', np.float64),
+    ('delta', np.float64),
+    ('annual_return', np.float64),
+    ('volume', np.int64),
+    ('oi', np.int64),
+    ('exp_idx', np.int16)
+])
+
+# score_chain status codes
+CANDIDATE = 0
+EXPIRED = 1
+LOW_PREMIUM = 2
+NO_EXPIRATION = 3  # set after scoring, for contracts whose expiration_date doesn't parse
+
+
+@njit(cache=True, fastmath=True)
+def estimate_delta(strike, days, iv, is_call, price):
+    """
+    Absolute delta for a contract Polygon returned without greeks.
+    Black-Scholes N(d1) (zero rates) where implied volatility is known, else a moneyness heuristic.
+    """
+    t = days / 365.0
+    inv_sqrt_t = 1.0 / math.sqrt(t)
+    if iv > 0:
+        d1 = (math.log(price / strike) + 0.5 * iv * iv * t) * inv_sqrt_t / iv
+        n_d1 = 0.5 * (1.0 + math.erf(d1 * 0.7071067811865476))  # standard normal CDF
+        return n_d1 if is_call else 1.0 - n_d1
+    moneyness = abs(strike - price) / price
+    return min(0.5, 1.0 / (1.0 + moneyness * 10.0 * inv_sqrt_t))
+
+
+@njit(cache=True, fastmath=True)
+def score_chain(strikes, days, bids, asks, closes, deltas, ivs, is_call, price, max_days):
+    """
+    Single pass over the extracted chain: expiry window, premium, delta and annualized return.
+    Returns (status, premiums, deltas, annual_returns); rows whose status isn't CANDIDATE are left unset.
+    """
+    n = strikes.shape[0]
+    status = np.empty(n, np.int8)
+    premiums = np.empty(n)
+    abs_deltas = np.empty(n)
+    annual_returns = np.empty(n)
+    # annual_return = premium / price * 365 / days * 100, with the per-chain part folded once
+    ann_scale = 36500.0 / price
+    for i in range(n):
+        # Keep <= 0 as expired to avoid division-by-zero below
+        if days[i] <= 0 or days[i] > max_days:
+            status[i] = EXPIRED
+            continue
+
+        # Midpoint when both sides are quoted, otherwise fall back to close
+        if bids[i] > 0 and asks[i] > 0:
+            premium = (bids[i] + asks[i]) * 0.5
+        else:
+            premium = closes[i]
+        if premium < 0.05:
+            status[i] = LOW_PREMIUM
+            continue
+
+        status[i] = CANDIDATE
+        premiums[i] = premium
+        if deltas[i] == 0:
+            abs_deltas[i] = estimate_delta(strikes[i], days[i], ivs[i], is_call[i], price)
+        else:
+            abs_deltas[i] = abs(deltas[i])
+        annual_returns[i] = premium * ann_scale / days[i]
+    return status, premiums, abs_deltas, annual_returns
+
+
+# Compile (or load from numba's on-disk cache) at import, so a worker's first request doesn't pay for it
+score_chain(
+    np.empty(0), np.empty(0, np.int64), np.empty(0), np.empty(0), np.empty(0), np.empty(0), np.empty(0),
+    np.empty(0, np.bool_), 1.0, MAX_DAYS_TO_EXPIRATION
+)
+
+
+# Slider drags bounce between a handful of settings; keying on fetched_at means a refetched
+# chain never reuses results filtered from the old one (those just age out of the LRU).
+@cached(
+    cache=LRUCache(maxsize=256),
+    key=lambda cached_result, *args, **kwargs: hashkey(
+        cached_result['symbol'], cached_result['fetched_at'], *args, **kwargs
+    ),
+    lock=CACHE_LOCK
+)
+def filter_cached_data(cached_result, max_delta_calls=0.18, max_delta_puts=0.18, filter_type='both'):
+    """Apply option type and delta filters to a cached chain and pick the top 30 by annual return"""
+    ticker = cached_result['symbol']
+    candidates = cached_result['candidates']
+
+    # Type and delta limits as masks over the cached columns
+    is_call = candidates['is_call']
+    deltas = candidates['delta']
+    matching = np.where(is_call, deltas <= max_delta_calls, deltas <= max_delta_puts)
+    if filter_type == 'calls':
+        matching &= is_call
+    elif filter_type == 'puts':
+        matching &= ~is_call
+    matches = np.flatnonzero(matching)
+
+    if matches.size == 0:
+        return None, (
+            f"No options found for {ticker} matching delta ≤ {max_delta_calls:.2f} (calls) / "
+            f"{max_delta_puts:.2f} (puts). Try increasing the delta filters."
+        )
 
-        if not POLYGON_API_KEY:
-            return None, "API key not configured. Please add POLYGON_API_KEY environment variable in Render dashboard."
+    # Top 30 by annual return: partition instead of sorting everything, then order just those
+    # (ties keep chain order)
+    annual_returns = candidates['annual_return']
+    top = matches
+    if top.size > 30:
+        top = np.sort(top[np.argpartition(-annual_returns[top], 29)[:30]])
+    top = top[np.argsort(-annual_returns[top], kind='stable')]
+
+    # Display strings are formatted here, for the rows actually shown, so the template doesn't
+    # run ~8 format filters per card on every render
+    expirations = cached_result['expirations']
+    options = []
+    for call, strike, days_to_exp, premium, bid, ask, delta, annual_return, volume, oi, exp_idx in (
+        candidates[top].tolist()
+    ):
+        options.append({
+            'type': 'Call' if call else 'Put',
+            'strike': strike,
+            'expiration': expirations[exp_idx],
+            'days': days_to_exp,
+            'premium': premium,
+            'bid': bid,
+            'ask': ask,
+            'delta': delta,
+            'annual_return': annual_return,
+            'volume': volume,
+            'oi': oi,
+            'strike_fmt': f"{strike:.2f}",
+            'premium_fmt': f"{premium:.2f}",
+            'bid_fmt': f"{bid:.2f}",
+            'ask_fmt': f"{ask:.2f}",
+            'delta_fmt': f"{delta:.3f}",
+            'annual_return_fmt': f"{annual_return:.1f}",
+            'volume_fmt': f"{volume:,}",
+            'oi_fmt': f"{oi:,}"
+        })
+
+    # Only what the page needs; the cached candidate array stays out of the template context
+    result = {
+        'symbol': ticker,
+        'price': cached_result['price'],
+        'timestamp': cached_result['timestamp'],
+        'fetched_at': cached_result['fetched_at'],
+        'options': options,
+        'max_delta_calls': max_delta_calls,
+        'max_delta_puts': max_delta_puts,
+        'filter_type': filter_type
+    }
+
+    log.debug("Found %d matching options for %s", matches.size, ticker)
+    return result, None
+
+
+def chain_cache_key(ticker):
+    # The shared tier outlives deploys (cache dir or Redis); keying on the build, like cached pages,
+    # means a new release never reads chains laid out by the previous code
+    return f"chain:{BUILD_ID}:{ticker}"
+
+
+def shared_chain(ticker):
+    """Chain another worker cached for this ticker, or None; unreadable or malformed entries count as misses"""
+    try:
+        entry = shared_cache.get(chain_cache_key(ticker))
+    except Exception as e:
+        log.warning("Ignoring unreadable cached chain for %s: %s", ticker, e)
+        return None
+    if entry is None:
+        return None
+    if not (
+        isinstance(entry, dict)
+        and {'symbol', 'price', 'timestamp', 'fetched_at', 'expirations'} <= entry.keys()
+        and isinstance(entry.get('candidates'), np.ndarray)
+        and entry['candidates'].dtype == CANDIDATE_DTYPE
+    ):
+        log.warning("Ignoring malformed cached chain for %s", ticker)
+        return None
+    return entry
+
+
+def load_chain(ticker):
+    """
+    Price and scored candidates for a ticker, from cache or fetched fresh from Polygon.io.
+    Nothing here depends on the delta or type filters, so filter changes never refetch.
+    """
+    with CACHE_LOCK:
+        cached_result = CACHE.get(ticker)
+    if cached_result is None:
+        # Another worker may already have fetched this ticker
+        cached_result = shared_chain(ticker)
+        if cached_result is not None:
+            with CACHE_LOCK:
+                CACHE[ticker] = cached_result
+    if cached_result is not None:
+        log.debug("Using cached data for %s", ticker)
+        return cached_result, None
+
+    log.debug("Fetching fresh data for %s", ticker)
+
+    # Fetch stock price and options chain (PAGINATED) concurrently; they don't depend on each other.
+    # Polygon's cursor pagination is sequential per query, so calls and puts are paginated as two
+    # independent streams, each with half the contract budget.
+    # For very active tickers, 2000 contracts is a decent balance between coverage and latency.
+    target_contracts = 2000 if ticker in ("SPY", "QQQ", "IWM") else 1000
+    # One deadline for the whole fetch: waits are bounded by it, every request's timeout is capped
+    # at the time left (and timeouts aren't retried), and the page loops stop at it, so a hung
+    # upstream can't leave orphaned fetches holding EXECUTOR threads
+    deadline = time.monotonic() + CHAIN_FETCH_TIMEOUT
+    price_future = EXECUTOR.submit(fetch_stock_price, ticker, deadline=deadline)
+    chain_futures = [
+        EXECUTOR.submit(
+            fetch_options_chain,
+            ticker,
+            max_pages=20,
+            page_limit=250,
+            target_contracts=target_contracts // 2,
+            contract_type=contract_type,
+            deadline=deadline
+        )
+        for contract_type in ('call', 'put')
+    ]
 
-        print(f"Fetching fresh data for {ticker}")
+    def abandon():
+        # Queued fetches never start; running ones stop at their next page (see deadline)
+        for future in chain_futures:
+            future.cancel()
 
-        # Fetch stock price
-        price, error = fetch_stock_price(ticker)
-        if error:
-            return None, f"Could not fetch price for {ticker}: {error}"
+    try:
+        price, error = price_future.result(timeout=max(0, deadline - time.monotonic()))
+    except TimeoutError:
+        abandon()
+        return None, f"Could not fetch price for {ticker}: timed out after {CHAIN_FETCH_TIMEOUT}s"
+    if error:
+        abandon()
+        return None, f"Could not fetch price for {ticker}: {error}"
 
-        print(f"Price for {ticker}: ${price}")
+    log.debug("Price for %s: $%s", ticker, price)
 
-        # Small delay between API calls
-        time.sleep(0.5)
+    _, pending = wait(chain_futures, timeout=max(0, deadline - time.monotonic()))
+    if pending:
+        abandon()
+        return None, f"Could not fetch options for {ticker}: timed out after {CHAIN_FETCH_TIMEOUT}s"
 
-        # Fetch options chain (PAGINATED)
-        # For very active tickers, 2000 contracts is a decent balance between coverage and latency.
-        target_contracts = 2000 if ticker in ("SPY", "QQQ", "IWM") else 1000
-        options_data, error = fetch_options_chain(
-            ticker,
-            max_pages=20,
-            page_limit=250,
-            target_contracts=target_contracts
-        )
+    options_data = []
+    for future in chain_futures:
+        results, error = future.result()
         if error:
             return None, f"Could not fetch options for {ticker}: {error}"
+        options_data.extend(results)
+
+    if not options_data:
+        return None, f"No options data available for {ticker}"
+
+    log.debug("Starting to process %d options", len(options_data))
+
+    # Process options as parallel arrays: one pass to pull out each field, then filter with vector ops
+    today = np.datetime64(date.today(), 'D')
+
+    contract_types, strikes, expiration_strs, deltas, ivs = [], [], [], [], []
+    bids, asks, closes, volumes, open_interest = [], [], [], [], []
+    no_details = 0
+    wrong_moneyness = 0
+
+    for option in options_data:
+        # details are almost always complete, so subscript and catch the rare miss
+        try:
+            details = option['details']
+            contract_type = details['contract_type']
+            strike = details['strike_price']
+            expiration_str = details['expiration_date']
+        except KeyError:
+            no_details += 1
+            continue
+        if contract_type is None or strike is None or expiration_str is None:
+            no_details += 1
+            continue
+
+        # Filter by moneyness here, before any expiration parsing: it's a plain float compare
+        if contract_type == 'call':
+            out_of_the_money = strike > price
+        else:
+            out_of_the_money = contract_type == 'put' and strike < price
+        if not out_of_the_money:
+            wrong_moneyness += 1
+            continue
+
+        greeks = option.get('greeks') or {}
+        # Pricing comes from the 'day' field (works on plans where last_quote may be missing)
+        day_data = option.get('day') or {}
+
+        contract_types.append(contract_type)
+        strikes.append(strike)
+        expiration_strs.append(expiration_str)
+        deltas.append(greeks.get('delta') or 0)
+        ivs.append(option.get('implied_volatility') or 0)
+        bids.append(day_data.get('low') or 0)  # low as proxy for bid
+        asks.append(day_data.get('high') or 0)  # high as proxy for ask
+        closes.append(day_data.get('close') or 0)
+        volumes.append(day_data.get('volume') or 0)
+        open_interest.append(option.get('open_interest') or 0)
+
+    contract_types = np.array(contract_types, dtype=str)
+    strikes = np.array(strikes, dtype=float)
+    deltas = np.array(deltas, dtype=float)
+    ivs = np.array(ivs, dtype=float)
+    bids = np.array(bids, dtype=float)
+    asks = np.array(asks, dtype=float)
+    closes = np.array(closes, dtype=float)
+    volumes = np.array(volumes, dtype=float)
+    open_interest = np.array(open_interest, dtype=float)
+
+    is_call = contract_types == 'call'
+
+    # Every expiration repeats across all its strikes: parse and label each distinct date once and
+    # broadcast its day count back to the rows. A malformed date only drops its own contracts.
+    expiration_values, exp_idx = np.unique(np.array(expiration_strs, dtype=str), return_inverse=True)
+    exp_days = np.zeros(expiration_values.size, np.int64)
+    exp_valid = np.ones(expiration_values.size, np.bool_)
+    expiration_labels = []
+    for j, expiration_str in enumerate(expiration_values.tolist()):
+        try:
+            exp_days[j] = (np.datetime64(expiration_str, 'D') - today).astype(np.int64)
+            expiration_labels.append(format_expiration(expiration_str))
+        except ValueError:
+            exp_valid[j] = False
+            expiration_labels.append('')
+    days = exp_days[exp_idx]
+    status, premiums, deltas, annual_returns = score_chain(
+        strikes, days, bids, asks, closes, deltas, ivs, is_call, price, MAX_DAYS_TO_EXPIRATION
+    )
+    status[~exp_valid[exp_idx]] = NO_EXPIRATION
+
+    skipped_reasons = {
+        'no_details': no_details,
+        'wrong_moneyness': wrong_moneyness,
+        'no_expiration': np.count_nonzero(status == NO_EXPIRATION),
+        'expired': np.count_nonzero(status == EXPIRED),
+        'low_premium': np.count_nonzero(status == LOW_PREMIUM),
+        'processed': np.count_nonzero(status == CANDIDATE)
+    }
+
+    # Build dicts for the survivors only. Option type and delta limits are applied per request
+    # in filter_cached_data.
+    keep = np.flatnonzero(status == CANDIDATE)
+
+    # One structured record per candidate; dicts are only built for the rows a page shows.
+    # Expirations are labelled once per distinct date and referenced by index.
+    candidates = np.empty(keep.size, dtype=CANDIDATE_DTYPE)
+    candidates['is_call'] = is_call[keep]
+    candidates['strike'] = strikes[keep]
+    candidates['days'] = days[keep]
+    candidates['premium'] = premiums[keep]
+    candidates['bid'] = bids[keep]
+    candidates['ask'] = asks[keep]
+    candidates['delta'] = deltas[keep]
+    candidates['annual_return'] = annual_returns[keep]
+    candidates['volume'] = volumes[keep]
+    candidates['oi'] = open_interest[keep]
+    candidates['exp_idx'] = exp_idx[keep]
+
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Processing complete. Reasons for skipping:")
+        for reason, count in skipped_reasons.items():
+            log.debug("  %s: %d", reason, count)
+    log.debug("Total accepted options: %d", candidates.size)
+
+    cached_result = {
+        'symbol': ticker,
+        'price': price,
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'fetched_at': time.time(),
+        'candidates': candidates,
+        'expirations': expiration_labels
+    }
+    with CACHE_LOCK:
+        CACHE[ticker] = cached_result
+    try:
+        shared_cache.set(chain_cache_key(ticker), cached_result, timeout=max(1, int(cache_ttl())))
+    except Exception as e:
+        # Other workers just refetch; this request still has its chain
+        log.warning("Could not share cached chain for %s: %s", ticker, e)
 
-        if not options_data:
-            return None, f"No options data available for {ticker}"
-
-        print(f"Starting to process {len(options_data)} options")
+    return cached_result, None
 
-        # Process options
-        all_options = []
-        today = date.today()
 
-        skipped_reasons = {
-            'no_details': 0,
-            'no_expiration': 0,
-            'expired': 0,
-            'wrong_type': 0,
-            'wrong_moneyness': 0,
-            'low_premium': 0,
-            'high_delta': 0,
-            'processed': 0
-        }
+def fetch_options_data(ticker, max_delta_calls=0.18, max_delta_puts=0.18, filter_type='both'):
+    """Fetch and process options data from Polygon.io"""
+    try:
+        ticker = ticker.upper()
 
-        for idx, option in enumerate(options_data):
-            try:
-                if idx < 3:  # Log first 3 options in detail
-                    print(f"Option {idx}: {option}")
-
-                details = option.get('details', {})
-                greeks = option.get('greeks', {})
-                contract_type = details.get('contract_type')
-                strike = details.get('strike_price')
-                expiration_str = details.get('expiration_date')
-
-                if not all([contract_type, strike, expiration_str]):
-                    skipped_reasons['no_details'] += 1
-                    continue
-
-                # Parse expiration
-                try:
-                    exp_date = datetime.strptime(expiration_str, "%Y-%m-%d").date()
-                except Exception:
-                    skipped_reasons['no_expiration'] += 1
-                    continue
-
-                days_to_exp = (exp_date - today).days
-                # Keep <= 0 as expired to avoid division-by-zero later
-                if days_to_exp <= 0 or days_to_exp > 90:
-                    skipped_reasons['expired'] += 1
-                    continue
-
-                # Filter by option type
-                if contract_type == 'call' and filter_type == 'puts':
-                    skipped_reasons['wrong_type'] += 1
-                    continue
-                if contract_type == 'put' and filter_type == 'calls':
-                    skipped_reasons['wrong_type'] += 1
-                    continue
-
-                # Filter by moneyness
-                # (Strike from API is usually numeric; keep comparisons safe)
-                strike = float(strike)
-                if contract_type == 'call' and strike <= price:
-                    skipped_reasons['wrong_moneyness'] += 1
-                    continue
-                if contract_type == 'put' and strike >= price:
-                    skipped_reasons['wrong_moneyness'] += 1
-                    continue
-
-                # Get pricing data from 'day' field (works on plans where last_quote may be missing)
-                day_data = option.get('day', {})
-
-                # Try to get bid/ask, fallback to close price
-                bid = day_data.get('low', 0) or 0  # low as proxy for bid
-                ask = day_data.get('high', 0) or 0  # high as proxy for ask
-                close = day_data.get('close', 0) or 0
-
-                # If no bid/ask, use close
-                if bid == 0 and ask == 0 and close > 0:
-                    premium = close
-                else:
-                    premium = (bid + ask) / 2 if (bid > 0 and ask > 0) else close
-
-                if idx < 5:
-                    print(f"Pricing: bid={bid}, ask={ask}, close={close}, premium={premium}")
-
-                if premium < 0.05:
-                    skipped_reasons['low_premium'] += 1
-                    continue
-
-                # Get or estimate delta
-                delta = greeks.get('delta', 0)
-                if delta == 0 or delta is None:
-                    # Estimate delta if not provided
-                    moneyness = abs((strike - price) / price)
-                    time_factor = days_to_exp / 365
-                    # Avoid weird math if time_factor is tiny (shouldn't be due to days_to_exp > 0)
-                    delta = min(0.5, 1.0 / (1.0 + moneyness * 10 / (time_factor ** 0.5)))
-                else:
-                    delta = abs(float(delta))
-
-                # Filter by delta
-                if contract_type == 'call' and delta > max_delta_calls:
-                    skipped_reasons['high_delta'] += 1
-                    if idx < 5:
-                        print(f"Skipping call: strike={strike}, delta={delta:.3f}, max={max_delta_calls}")
-                    continue
-                if contract_type == 'put' and delta > max_delta_puts:
-                    skipped_reasons['high_delta'] += 1
-                    if idx < 5:
-                        print(f"Skipping put: strike={strike}, delta={delta:.3f}, max={max_delta_puts}")
-                    continue
-
-                # Calculate annualized return
-                annual_return = (premium / price) * (365 / days_to_exp) * 100
-
-                skipped_reasons['processed'] += 1
-
-                if idx < 3:
-                    print(
-                        f"✓ ACCEPTED: {contract_type} strike={strike}, delta={delta:.3f}, "
-                        f"premium={premium:.2f}, annual={annual_return:.1f}%"
-                    )
-
-                all_options.append({
-                    'type': 'Call' if contract_type == 'call' else 'Put',
-                    'strike': float(strike),
-                    'expiration': exp_date.strftime('%b %d, %Y'),
-                    'days': days_to_exp,
-                    'premium': premium,
-                    'bid': bid,
-                    'ask': ask,
-                    'delta': delta,
-                    'annual_return': annual_return,
-                    'volume': option.get('day', {}).get('volume', 0) or 0,
-                    'oi': option.get('open_interest', 0) or 0
-                })
-
-            except Exception as e:
-                print(f"Error processing option: {e}")
-                continue
-
-        print("Processing complete. Reasons for skipping:")
-        for reason, count in skipped_reasons.items():
-            print(f"  {reason}: {count}")
-        print(f"Total accepted options: {len(all_options)}")
-
-        # Sort by annual return
-        all_options.sort(key=lambda x: x['annual_return'], reverse=True)
-
-        result = {
-            'symbol': ticker,
-            'price': price,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'options': all_options[:30],
-            'max_delta_calls': max_delta_calls,
-            'max_delta_puts': max_delta_puts,
-            'filter_type': filter_type,
-            'all_options': all_options
-        }
+        if not POLYGON_API_KEY:
+            return None, "API key not configured. Please add POLYGON_API_KEY environment variable in Render dashboard."
 
-        if len(all_options) == 0:
-            return None, (
-                f"No options found for {ticker} matching delta ≤ {max_delta_calls:.2f} (calls) / "
-                f"{max_delta_puts:.2f} (puts). Try increasing the delta filters."
-            )
+        chain, error = load_chain(ticker)
+        if error:
+            return None, error
 
-        print(f"Found {len(all_options)} matching options for {ticker}")
-        return result, None
+        return filter_cached_data(chain, max_delta_calls, max_delta_puts, filter_type)
 
     except Exception as e:
         # Defensive: never let this function return None implicitly
-        print(f"fetch_options_data failed for {ticker}: {e}")
+        log.exception("fetch_options_data failed for %s: %s", ticker, e)
         return None, f"Internal error processing options for {ticker}: {str(e)}"
 
 
@@ -313,202 +723,14 @@ HTML_TEMPLATE = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Options Analyzer - {{ symbol }}</title>
-    <style>
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Arial, sans-serif;
-            margin: 0;
-            padding: 20px;
-            background: linear-gradient(135deg, #1e293b 0%, #0f172a 100%);
-            color: white;
-            min-height: 100vh;
-        }
-        .container { max-width: 1200px; margin: 0 auto; }
-        .header {
-            background: rgba(255,255,255,0.1);
-            padding: 20px;
-            border-radius: 15px;
-            margin-bottom: 20px;
-            backdrop-filter: blur(10px);
-        }
-        .header h1 { margin: 0 0 10px 0; font-size: 28px; }
-        .price { font-size: 36px; font-weight: bold; color: #10b981; }
-        .controls {
-            background: rgba(255,255,255,0.1);
-            padding: 20px;
-            border-radius: 15px;
-            margin-bottom: 20px;
-            backdrop-filter: blur(10px);
-        }
-        .control-section { margin-bottom: 20px; }
-        .control-section:last-child { margin-bottom: 0; }
-        .control-label {
-            display: block;
-            font-size: 14px;
-            font-weight: 600;
-            color: #94a3b8;
-            margin-bottom: 8px;
-        }
-        .ticker-input {
-            display: flex;
-            gap: 10px;
-            flex-wrap: wrap;
-        }
-        .ticker-input input {
-            flex: 1;
-            min-width: 150px;
-            padding: 12px 16px;
-            background: rgba(255,255,255,0.1);
-            border: 1px solid rgba(255,255,255,0.2);
-            border-radius: 8px;
-            color: white;
-            font-size: 16px;
-        }
-        .ticker-input input::placeholder { color: #64748b; }
-        .ticker-input button, .btn {
-            padding: 12px 24px;
-            background: #10b981;
-            border: none;
-            border-radius: 8px;
-            color: white;
-            font-weight: 600;
-            cursor: pointer;
-            font-size: 14px;
-        }
-        .ticker-input button:hover, .btn:hover { background: #059669; }
-        .quick-picks {
-            display: flex;
-            gap: 8px;
-            flex-wrap: wrap;
-            margin-top: 10px;
-        }
-        .quick-picks a {
-            padding: 8px 16px;
-            background: rgba(59, 130, 246, 0.2);
-            color: white;
-            text-decoration: none;
-            border-radius: 6px;
-            border: 1px solid rgba(59, 130, 246, 0.3);
-            font-weight: 600;
-            font-size: 14px;
-        }
-        .quick-picks a:hover { background: rgba(59, 130, 246, 0.3); }
-        .slider-container { margin-top: 10px; }
-        .slider {
-            width: 100%;
-            height: 6px;
-            border-radius: 3px;
-            background: rgba(255,255,255,0.2);
-            outline: none;
-            -webkit-appearance: none;
-        }
-        .slider::-webkit-slider-thumb {
-            -webkit-appearance: none;
-            appearance: none;
-            width: 18px;
-            height: 18px;
-            border-radius: 50%;
-            background: #10b981;
-            cursor: pointer;
-        }
-        .slider::-moz-range-thumb {
-            width: 18px;
-            height: 18px;
-            border-radius: 50%;
-            background: #10b981;
-            cursor: pointer;
-            border: none;
-        }
-        .slider-value {
-            display: inline-block;
-            margin-left: 10px;
-            font-weight: 600;
-            color: #10b981;
-        }
-        .filter-buttons {
-            display: flex;
-            gap: 10px;
-            margin-top: 10px;
-        }
-        .filter-btn {
-            flex: 1;
-            padding: 12px;
-            background: rgba(255,255,255,0.1);
-            border: 1px solid rgba(255,255,255,0.2);
-            border-radius: 8px;
-            color: white;
-            font-weight: 600;
-            cursor: pointer;
-            text-align: center;
-            text-decoration: none;
-            font-size: 14px;
-        }
-        .filter-btn.active {
-            background: #3b82f6;
-            border-color: #3b82f6;
-        }
-        .filter-btn:hover { background: rgba(59, 130, 246, 0.3); }
-        .grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(280px, 1fr));
-            gap: 15px;
-        }
-        .card {
-            background: rgba(255,255,255,0.1);
-            padding: 20px;
-            border-radius: 12px;
-            border: 1px solid rgba(255,255,255,0.2);
-        }
-        .card-header {
-            display: flex;
-            justify-content: space-between;
-            margin-bottom: 15px;
-            padding-bottom: 15px;
-            border-bottom: 1px solid rgba(255,255,255,0.1);
-        }
-        .strike { font-size: 24px; font-weight: bold; }
-        .annual-return {
-            font-size: 20px;
-            font-weight: bold;
-            color: #10b981;
-        }
-        .type-badge {
-            display: inline-block;
-            padding: 4px 12px;
-            border-radius: 12px;
-            font-size: 12px;
-            font-weight: bold;
-            margin-bottom: 10px;
-        }
-        .type-call { background: #3b82f6; }
-        .type-put { background: #8b5cf6; }
-        .metric {
-            display: flex;
-            justify-content: space-between;
-            padding: 6px 0;
-            font-size: 14px;
-        }
-        .metric-label { color: #94a3b8; }
-        .metric-value { font-weight: 600; }
-        .timestamp {
-            text-align: center;
-            color: #64748b;
-            margin: 30px 0;
-            font-size: 14px;
-        }
-        @media (max-width: 768px) {
-            .grid { grid-template-columns: 1fr; }
-            .header h1 { font-size: 24px; }
-            .price { font-size: 28px; }
-            .filter-buttons { flex-direction: column; }
-        }
-    </style>
+    <link rel="stylesheet" href="/static/app.css?v={{ css_version }}">
 </head>
 <body>
     <div class="container">
         <div class="header">
             <h1>📊 Options Strategy Analyzer</h1>
-            <div class="price">{{ symbol }}: ${{ "%.2f"|format(price) }}</div>
-            <p style="color: #94a3b8; margin: 5px 0 0 0;">{{ timestamp }} • Powered by Polygon.io</p>
+            <div class="price" id="price">{{ symbol }}: ${{ "%.2f"|format(price) }}</div>
+            <p style="color: #94a3b8; margin: 5px 0 0 0;"><span id="timestamp">{{ timestamp }}</span> • Powered by Polygon.io</p>
         </div>
 
         <div class="controls">
@@ -522,119 +744,275 @@ HTML_TEMPLATE = """
                     <button type="submit">Analyze</button>
                 </form>
                 <div class="quick-picks">
-                    <a href="/?symbol=SPY&delta_calls={{ max_delta_calls }}&delta_puts={{ max_delta_puts }}&filter={{ filter_type }}">SPY</a>
-                    <a href="/?symbol=GS&delta_calls={{ max_delta_calls }}&delta_puts={{ max_delta_puts }}&filter={{ filter_type }}">GS</a>
-                    <a href="/?symbol=QQQM&delta_calls={{ max_delta_calls }}&delta_puts={{ max_delta_puts }}&filter={{ filter_type }}">QQQM</a>
-                    <a href="/?symbol=IVV&delta_calls={{ max_delta_calls }}&delta_puts={{ max_delta_puts }}&filter={{ filter_type }}">IVV</a>
+                    {% for pick in ['SPY', 'GS', 'QQQM', 'IVV'] %}
+                    <a data-symbol="{{ pick }}" href="/?symbol={{ pick }}&delta_calls={{ max_delta_calls }}&delta_puts={{ max_delta_puts }}&filter={{ filter_type }}">{{ pick }}</a>
+                    {% endfor %}
                 </div>
             </div>
 
             <div class="control-section">
-                <label class="control-label">Max Delta - Calls<span class="slider-value">{{ "%.2f"|format(max_delta_calls) }}</span></label>
+                <label class="control-label">Max Delta - Calls<span class="slider-value" id="delta-calls-value">{{ "%.2f"|format(max_delta_calls) }}</span></label>
                 <div class="slider-container">
-                    <input type="range" class="slider" min="0.05" max="0.50" step="0.01" value="{{ max_delta_calls }}"
-                           onchange="window.location.href='/?symbol={{ symbol }}&delta_calls='+this.value+'&delta_puts={{ max_delta_puts }}&filter={{ filter_type }}'">
+                    <input type="range" class="slider" id="delta-calls" min="0.05" max="0.50" step="0.01" value="{{ max_delta_calls }}">
                 </div>
             </div>
 
             <div class="control-section">
-                <label class="control-label">Max Delta - Puts<span class="slider-value">{{ "%.2f"|format(max_delta_puts) }}</span></label>
+                <label class="control-label">Max Delta - Puts<span class="slider-value" id="delta-puts-value">{{ "%.2f"|format(max_delta_puts) }}</span></label>
                 <div class="slider-container">
-                    <input type="range" class="slider" min="0.05" max="0.50" step="0.01" value="{{ max_delta_puts }}"
-                           onchange="window.location.href='/?symbol={{ symbol }}&delta_calls={{ max_delta_calls }}&delta_puts='+this.value+'&filter={{ filter_type }}'">
+                    <input type="range" class="slider" id="delta-puts" min="0.05" max="0.50" step="0.01" value="{{ max_delta_puts }}">
                 </div>
             </div>
 
             <div class="control-section">
                 <label class="control-label">Show Options</label>
                 <div class="filter-buttons">
-                    <a href="/?symbol={{ symbol }}&delta_calls={{ max_delta_calls }}&delta_puts={{ max_delta_puts }}&filter=both"
-                       class="filter-btn {% if filter_type == 'both' %}active{% endif %}">Both</a>
-                    <a href="/?symbol={{ symbol }}&delta_calls={{ max_delta_calls }}&delta_puts={{ max_delta_puts }}&filter=calls"
-                       class="filter-btn {% if filter_type == 'calls' %}active{% endif %}">Calls Only</a>
-                    <a href="/?symbol={{ symbol }}&delta_calls={{ max_delta_calls }}&delta_puts={{ max_delta_puts }}&filter=puts"
-                       class="filter-btn {% if filter_type == 'puts' %}active{% endif %}">Puts Only</a>
+                    {% for value, label in [('both', 'Both'), ('calls', 'Calls Only'), ('puts', 'Puts Only')] %}
+                    <a data-filter="{{ value }}" href="/?symbol={{ symbol }}&delta_calls={{ max_delta_calls }}&delta_puts={{ max_delta_puts }}&filter={{ value }}"
+                       class="filter-btn {% if filter_type == value %}active{% endif %}">{{ label }}</a>
+                    {% endfor %}
                 </div>
             </div>
         </div>
 
-        {% if error %}
-        <div class="card" style="background: rgba(239, 68, 68, 0.2); border-color: rgba(239, 68, 68, 0.5);">
-            <p>❌ Error: {{ error }}</p>
-        </div>
-        {% else %}
-        <h2 style="margin: 30px 0 20px 0;">Top Income Opportunities</h2>
-        <div class="grid">
-            {% for opt in options %}
-            <div class="card">
-                <span class="type-badge type-{{ opt.type.lower() }}">{{ opt.type }}</span>
-                <div class="card-header">
-                    <div class="strike">${{ "%.2f"|format(opt.strike) }}</div>
-                    <div class="annual-return">{{ "%.1f"|format(opt.annual_return) }}%</div>
-                </div>
-                <div class="metric">
-                    <span class="metric-label">Expiration</span>
-                    <span class="metric-value">{{ opt.expiration }} ({{ opt.days }}d)</span>
-                </div>
-                <div class="metric">
-                    <span class="metric-label">Premium</span>
-                    <span class="metric-value" style="color: #10b981;">${{ "%.2f"|format(opt.premium) }}</span>
-                </div>
-                <div class="metric">
-                    <span class="metric-label">Bid / Ask</span>
-                    <span class="metric-value">${{ "%.2f"|format(opt.bid) }} / ${{ "%.2f"|format(opt.ask) }}</span>
-                </div>
-                <div class="metric">
-                    <span class="metric-label">Delta</span>
-                    <span class="metric-value">{{ "%.3f"|format(opt.delta) }}</span>
-                </div>
-                <div class="metric">
-                    <span class="metric-label">Volume</span>
-                    <span class="metric-value">{{ "{:,}".format(opt.volume) }}</span>
-                </div>
-                <div class="metric">
-                    <span class="metric-label">Open Interest</span>
-                    <span class="metric-value">{{ "{:,}".format(opt.oi) }}</span>
-                </div>
-            </div>
-            {% endfor %}
-        </div>
-        {% endif %}
+        <div id="results">{{ results_html }}</div>
 
         <div class="timestamp">
-            💡 Real-time data from Polygon.io • Refreshes on every request
+            💡 Data from Polygon.io • Refreshed at most every {{ open_refresh_minutes }} minutes during market hours, every {{ closed_refresh_minutes }} minutes otherwise
         </div>
     </div>
+    <script>
+        /* Slider and filter changes fetch /api/options and redraw only the results; the links
+           and form keep working without JS. */
+        const state = {
+            symbol: {{ symbol|tojson }},
+            delta_calls: {{ max_delta_calls|tojson }},
+            delta_puts: {{ max_delta_puts|tojson }},
+            filter: {{ filter_type|tojson }}
+        };
+
+        function query(overrides) {
+            return new URLSearchParams(Object.assign({}, state, overrides)).toString();
+        }
+
+        function syncControls() {
+            document.querySelectorAll('.quick-picks a').forEach(a => {
+                a.href = '/?' + query({symbol: a.dataset.symbol});
+            });
+            document.querySelectorAll('.filter-btn').forEach(a => {
+                a.href = '/?' + query({filter: a.dataset.filter});
+                a.classList.toggle('active', a.dataset.filter === state.filter);
+            });
+            document.querySelector('input[name=delta_calls]').value = state.delta_calls;
+            document.querySelector('input[name=delta_puts]').value = state.delta_puts;
+            document.querySelector('input[name=filter]').value = state.filter;
+            history.replaceState(null, '', '/?' + query({}));
+        }
+
+        let pending = null;
+        async function refresh() {
+            syncControls();
+            if (pending) pending.abort();
+            pending = new AbortController();
+            let data;
+            try {
+                const response = await fetch('/api/options?' + query({}), {signal: pending.signal});
+                data = await response.json();
+            } catch (e) {
+                if (e.name === 'AbortError') return;
+                document.getElementById('results').textContent = '❌ Could not load options. Please try again.';
+                return;
+            }
+            /* The server renders the results with the same template as the page */
+            document.getElementById('results').innerHTML = data.results_html;
+            if (!data.error) {
+                document.getElementById('price').textContent = `${data.symbol}: $${data.price.toFixed(2)}`;
+                document.getElementById('timestamp').textContent = data.timestamp;
+            }
+        }
+
+        [['delta-calls', 'delta_calls'], ['delta-puts', 'delta_puts']].forEach(([id, key]) => {
+            const slider = document.getElementById(id);
+            slider.addEventListener('input', () => {
+                document.getElementById(id + '-value').textContent = Number(slider.value).toFixed(2);
+            });
+            slider.addEventListener('change', () => {
+                state[key] = slider.value;
+                refresh();
+            });
+        });
+
+        document.querySelectorAll('.filter-btn').forEach(a => {
+            a.addEventListener('click', event => {
+                event.preventDefault();
+                state.filter = a.dataset.filter;
+                refresh();
+            });
+        });
+    </script>
 </body>
 </html>
 """
 
+# The top-opportunities grid (or error card): rendered into the page, and returned by /api/options
+# so in-place refreshes use the same markup
+RESULTS_TEMPLATE = """
+{% if error %}
+<div class="card error-card">
+    <p>❌ Error: {{ error }}</p>
+</div>
+{% else %}
+<h2 class="results-title">Top Income Opportunities</h2>
+<div class="grid">
+    {% for opt in options %}
+    <div class="card">
+        <span class="type-badge type-{{ opt.type.lower() }}">{{ opt.type }}</span>
+        <div class="card-header">
+            <div class="strike">${{ opt.strike_fmt }}</div>
+            <div class="annual-return">{{ opt.annual_return_fmt }}%</div>
+        </div>
+        <div class="metric">
+            <span class="metric-label">Expiration</span>
+            <span class="metric-value">{{ opt.expiration }} ({{ opt.days }}d)</span>
+        </div>
+        <div class="metric">
+            <span class="metric-label">Premium</span>
+            <span class="metric-value premium">${{ opt.premium_fmt }}</span>
+        </div>
+        <div class="metric">
+            <span class="metric-label">Bid / Ask</span>
+            <span class="metric-value">${{ opt.bid_fmt }} / ${{ opt.ask_fmt }}</span>
+        </div>
+        <div class="metric">
+            <span class="metric-label">Delta</span>
+            <span class="metric-value">{{ opt.delta_fmt }}</span>
+        </div>
+        <div class="metric">
+            <span class="metric-label">Volume</span>
+            <span class="metric-value">{{ opt.volume_fmt }}</span>
+        </div>
+        <div class="metric">
+            <span class="metric-label">Open Interest</span>
+            <span class="metric-value">{{ opt.oi_fmt }}</span>
+        </div>
+    </div>
+    {% endfor %}
+</div>
+{% endif %}
+"""
+
+# Collapse indentation/newlines (no <pre>, and the script only uses /* */ comments and HTML
+# template literals, so this is safe),
+# then compile once at import instead of on every request
+HTML_TEMPLATE = re.sub(r'\s+', ' ', HTML_TEMPLATE).strip()
+RESULTS_TEMPLATE = re.sub(r'\s+', ' ', RESULTS_TEMPLATE).strip()
 
-@app.route('/')
-def home():
+# The stylesheet is served from static/ so browsers keep it across page loads; its content hash
+# goes in the URL so a deploy that changes it isn't stuck behind the year-long cache
+with open(os.path.join(app.static_folder, 'app.css'), 'rb') as css_file:
+    CSS_VERSION = hashlib.blake2b(css_file.read(), digest_size=8).hexdigest()
+
+COMPILED_RESULTS = app.jinja_env.from_string(RESULTS_TEMPLATE)
+COMPILED_TEMPLATE = app.jinja_env.from_string(HTML_TEMPLATE, globals={
+    'css_version': CSS_VERSION,
+    'open_refresh_minutes': CACHE_DURATION // 60,
+    'closed_refresh_minutes': CACHE_DURATION_CLOSED // 60
+})
+
+
+def render_results(options, error=None):
+    """Results grid (or error card) markup, for the page and for /api/options"""
+    return Markup(COMPILED_RESULTS.render(options=options, error=error))
+
+
+def read_filters():
+    """Ticker and filter settings from the query string, shared by the page and the JSON API"""
     symbol = request.args.get('symbol', 'SPY').upper()
     delta_calls = float(request.args.get('delta_calls', 0.18))
     delta_puts = float(request.args.get('delta_puts', 0.18))
     filter_type = request.args.get('filter', 'both')
+    return symbol, delta_calls, delta_puts, filter_type
+
 
-    print(f"Request: {symbol} (Calls Δ≤{delta_calls}, Puts Δ≤{delta_puts}, Filter: {filter_type})")
+def cacheable(response, symbol, delta_calls, delta_puts, filter_type, fetched_at):
+    """
+    Tag a successful response for browser/edge revalidation and the shared page cache.
+    Its content only changes with the query, the underlying chain fetch, or a deploy that
+    changes the template or stylesheet.
+    """
+    etag = hashlib.blake2b(
+        f"{BUILD_ID}|{CSS_VERSION}|{symbol}|{delta_calls}|{delta_puts}|{filter_type}|{fetched_at}".encode(),
+        digest_size=8
+    ).hexdigest()
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'public, max-age=60, stale-while-revalidate=300'
+    return CachedResponse(response, timeout=page_cache_timeout())
+
+
+@app.route('/')
+# Only successful pages come back as CachedResponse; error pages are never cached
+@shared_cache.cached(make_cache_key=page_cache_key, response_filter=lambda rv: isinstance(rv, CachedResponse))
+def home():
+    symbol, delta_calls, delta_puts, filter_type = read_filters()
+
+    log.debug("Request: %s (Calls Δ≤%s, Puts Δ≤%s, Filter: %s)", symbol, delta_calls, delta_puts, filter_type)
 
     data, error = fetch_options_data(symbol, delta_calls, delta_puts, filter_type)
 
     if error:
-        return render_template_string(
-            HTML_TEMPLATE,
+        return COMPILED_TEMPLATE.render(
             symbol=symbol,
             price=0,
             timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            error=error,
-            options=[],
+            results_html=render_results([], error),
             max_delta_calls=delta_calls,
             max_delta_puts=delta_puts,
             filter_type=filter_type
         )
 
-    return render_template_string(HTML_TEMPLATE, **data, error=None)
+    response = Response(COMPILED_TEMPLATE.render(**data, results_html=render_results(data['options'])))
+    return cacheable(response, symbol, delta_calls, delta_puts, filter_type, data['fetched_at'])
+
+
+@app.route('/api/options')
+@shared_cache.cached(make_cache_key=page_cache_key, response_filter=lambda rv: isinstance(rv, CachedResponse))
+def api_options():
+    """Same results as the page, as JSON plus the rendered grid, so slider and filter changes only redraw it"""
+    symbol, delta_calls, delta_puts, filter_type = read_filters()
+
+    log.debug("API request: %s (Calls Δ≤%s, Puts Δ≤%s, Filter: %s)", symbol, delta_calls, delta_puts, filter_type)
+
+    data, error = fetch_options_data(symbol, delta_calls, delta_puts, filter_type)
+
+    if error:
+        return jsonify(error=error, results_html=str(render_results([], error)))
+
+    response = jsonify({**data, 'results_html': str(render_results(data['options']))})
+    return cacheable(response, symbol, delta_calls, delta_puts, filter_type, data['fetched_at'])
+
+
+@app.after_request
+def answer_conditional_request(response):
+    """Swap a 200 for a 304 when the client already holds this page (also covers page-cache hits)"""
+    etag, _ = response.get_etag()
+    if response.status_code != 200 or not etag:
+        return response
+    # Flask-Compress tags compressed bodies as "<etag>:gzip" / "<etag>:br"; match on the base tag
+    client_etags = {tag.split(':', 1)[0] for tag in request.if_none_match.as_set()}
+    if etag not in client_etags:
+        return response
+    not_modified = Response(status=304)
+    not_modified.set_etag(etag)
+    not_modified.headers['Cache-Control'] = response.headers.get('Cache-Control', '')
+    return not_modified
+
+
+@app.after_request
+def mark_static_immutable(response):
+    """Versioned static URLs never change content, so browsers needn't revalidate them either"""
+    if request.endpoint == 'static' and response.status_code == 200:
+        response.cache_control.immutable = True
+    return response
 
 
 if __name__ == '__main__':